@@ -2,6 +2,20 @@
 Minimal restrictive parser for bibliography bib-files.
 """
 import textwrap as _textwrap
+import tempfile as _tempfile
+import pickle as _pickle
+import heapq as _heapq
+import shutil as _shutil
+import sys as _sys
+import os as _os
+import asyncio as _asyncio
+import codecs as _codecs
+import collections as _collections
+import contextlib as _contextlib
+from .snapshot import save_snapshot
+from .snapshot import open_snapshot
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
 
 
 def loads(b):
@@ -21,53 +35,14 @@ def loads(b):
     b : bytes
             The raw bytes of a bib-file.
     """
-    raw_entries = _split_raw_entries(bib_B=b)
-
-    entries = []
-    for _entry_B in raw_entries:
-        try:
-            entry_B = bytes(_entry_B)
-            entry_B = _remove_trailing_comments_from_entry_bytes(
-                entry_B=entry_B
-            )
-            entry_B = bytes.replace(entry_B, b"\r", b"")
-            entry_B = bytes.replace(entry_B, b"\n", b"")
-            entries.append(entry_B)
-        except Exception as err:
-            print("Error in: ", entry_B)
-            raise err
-
     bib = {
         "entries": [],
         "strings": [],
         "preambles": [],
     }
-
-    for entry_B in entries:
-        try:
-            entrytype_B = _parse_entrytype_bytes(entry_B=entry_B)
-            if bytes.lower(entrytype_B) == b"string":
-                fields_B = _parse_fields_bytes(entry_B=entry_B)
-                field_dict = _parse_fields_into_dict(fields_B=fields_B)
-                string = {}
-                string["fields"] = field_dict
-                bib["strings"].append(string)
-            elif bytes.lower(entrytype_B) == b"preamble":
-                preamble = _parse_preamble_bytes(entry_B=entry_B)
-                bib["preambles"].append(preamble)
-            else:
-                citekey_B = _parse_citekey_bytes(entry_B=entry_B)
-                fields_B = _parse_fields_bytes(entry_B=entry_B)
-                field_dict = _parse_fields_into_dict(fields_B=fields_B)
-                entry = {}
-                entry["fields"] = field_dict
-                entry["type"] = entrytype_B
-                entry["citekey"] = citekey_B
-                bib["entries"].append(entry)
-        except Exception as err:
-            print("Error in: ", entry_B)
-            raise err
-
+    for raw_entry_B in _split_raw_entries(bib_B=b):
+        section, item = _parse_raw_entry(raw_entry_B=raw_entry_B)
+        bib[section].append(item)
     return bib
 
 
@@ -81,13 +56,15 @@ def normalize(
     citekey_lower=True,
     citekey_ascii=True,
     preamble_values_ascii=True,
+    encoding="ascii",
+    errors="strict",
 ):
     """
     Returns a bib-dictionary
 
     - Converts keys to lower-case
-    - Decodes keys to ascii
-    - DEcodes values to ascii
+    - Decodes keys with encoding (ascii)
+    - DEcodes values with encoding (ascii)
 
     Parameters
     ----------
@@ -95,55 +72,46 @@ def normalize(
             The entrie's field-keys are converted to lower case.
             All field options apply to '@entries' and '@string-entries'.
     field_keys_ascii : Bool (True)
-            The entrie's field-keys are decoded in ascii.
+            The entrie's field-keys are decoded with encoding.
     field_values_ascii : Bool (True)
-            The entrie's field-values are decoded in ascii.
+            The entrie's field-values are decoded with encoding.
     type_lower : Bool (True)
             The entrie's type-key is converted to lower case.
     type_ascii : Bool (True)
-            The entrie's type-key is decoded in ascii.
+            The entrie's type-key is decoded with encoding.
     citekey_lower : Bool (True),
             The entrie's cite-key is converted to lower case.
     citekey_ascii : Bool (True)
-            The entrie's cite-key is decoded in ascii.
+            The entrie's cite-key is decoded with encoding.
     preamble_values_ascii : Bool (True)
-            The preamble-entrie's values are decoded in ascii.
+            The preamble-entrie's values are decoded with encoding.
+    encoding : str ("ascii")
+            The encoding used for all the decoding above, e.g. 'utf-8', or
+            'latin-1'.
+    errors : str ("strict")
+            How to handle errors in decoding, see bytes.decode.
     """
+    encoding = _resolve_encoding(encoding=encoding)
     out = {}
-    out["entries"] = []
-    for entry in raw_byte_bib["entries"]:
-        out["entries"].append(
-            _normalize_entry(
-                entry=entry,
-                field_keys_lower=field_keys_lower,
-                field_keys_ascii=field_keys_ascii,
-                field_values_ascii=field_values_ascii,
-                type_lower=type_lower,
-                type_ascii=type_ascii,
-                citekey_lower=citekey_lower,
-                citekey_ascii=citekey_ascii,
-            )
-        )
-
-    out["strings"] = []
-    for string_entry in raw_byte_bib["strings"]:
-        out["strings"].append(
-            _normalize_entry(
-                entry=string_entry,
-                field_keys_lower=field_keys_lower,
-                field_keys_ascii=field_keys_ascii,
-                field_values_ascii=field_values_ascii,
-                type_lower=type_lower,
-                type_ascii=type_ascii,
+    for section in ["entries", "strings", "preambles"]:
+        out[section] = []
+        for item in raw_byte_bib[section]:
+            out[section].append(
+                _normalize_item(
+                    section=section,
+                    item=item,
+                    field_keys_lower=field_keys_lower,
+                    field_keys_ascii=field_keys_ascii,
+                    field_values_ascii=field_values_ascii,
+                    type_lower=type_lower,
+                    type_ascii=type_ascii,
+                    citekey_lower=citekey_lower,
+                    citekey_ascii=citekey_ascii,
+                    preamble_values_ascii=preamble_values_ascii,
+                    encoding=encoding,
+                    errors=errors,
+                )
             )
-        )
-
-    out["preambles"] = []
-    for preamble_entry in raw_byte_bib["preambles"]:
-        if preamble_values_ascii:
-            out["preambles"].append(_decode_ascii(B=preamble_entry))
-        else:
-            out["preambles"].append(preamble_entry)
     return out
 
 
@@ -159,32 +127,518 @@ def dumps(bib, indent=4, width=79):
             Max number of columns before wrapping of fields in entries.
     """
     buff = str()
-    for preamble in bib["preambles"]:
-        buff += "@preamble{"
-        buff += preamble
-        buff += "}\n"
-        buff += "\n"
-    for string in bib["strings"]:
-        buff += _dumps_entry(
-            entrytype="string",
-            citekey=None,
-            fields=string["fields"],
-            indent=indent,
-            width=width,
+    for section in ["preambles", "strings", "entries"]:
+        for item in bib[section]:
+            buff += _dumps_item(
+                section=section, item=item, indent=indent, width=width
+            )
+    return buff
+
+
+def iter_loads(f, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields (section, item) for every entry in the binary stream f where
+    section is one of 'entries', 'strings', or 'preambles' and item is the
+    same raw-byte-item loads would append to this section.
+    Only one entry is held in memory at a time.
+
+    Parameters
+    ----------
+    f : binary file-object
+            The stream of a bib-file.
+    chunk_size : int
+            Number of bytes read at once.
+    """
+    for raw_entry_B in _iter_raw_entries_from_stream(
+        f=f, chunk_size=chunk_size
+    ):
+        yield _parse_raw_entry(raw_entry_B=raw_entry_B)
+
+
+def iter_normalize(items, **kwargs):
+    """
+    Yields (section, item) with each item normalized as normalize does.
+
+    Parameters
+    ----------
+    items : iterable of (section, item)
+            E.g. from iter_loads.
+    kwargs :
+            The options of normalize.
+    """
+    if "encoding" in kwargs:
+        kwargs["encoding"] = _resolve_encoding(encoding=kwargs["encoding"])
+    for section, item in items:
+        yield section, _normalize_item(section=section, item=item, **kwargs)
+
+
+def iter_dumps(items, indent=4, width=79):
+    """
+    Yields the string of each (section, item) as dumps writes it.
+    Other than dumps, the items are not grouped into preambles, strings, and
+    entries but stay in their order.
+
+    Parameters
+    ----------
+    items : iterable of (section, item)
+            E.g. from iter_normalize.
+    indent : int (4)
+            See dumps.
+    width : int (79)
+            See dumps.
+    """
+    for section, item in items:
+        yield _dumps_item(
+            section=section, item=item, indent=indent, width=width
         )
-        buff += "\n"
-    for entry in bib["entries"]:
-        buff += _dumps_entry(
-            entrytype=entry["type"],
-            citekey=entry["citekey"],
-            fields=entry["fields"],
-            indent=indent,
-            width=width,
+
+
+def transform(
+    inp,
+    out,
+    stages=(),
+    normalize_kwargs=None,
+    indent=4,
+    width=79,
+    out_encoding="utf-8",
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    executor=None,
+    batch_size=256,
+    max_pending=8,
+):
+    """
+    Loads, normalizes, transforms, and dumps a bib-file entry by entry so
+    that the memory used does not grow with the size of the bib-file.
+    The items are written in the order they are read.
+
+    Parameters
+    ----------
+    inp : str, or binary file-object
+            The bib-file to read from.
+    out : str, or text file-object
+            The bib-file to write to. A path is opened with out_encoding.
+    stages : list of functions
+            Each stage is called as stage(section, item) with a normalized
+            item and returns the item to pass on, or None to drop it.
+            The stages run in their order.
+    normalize_kwargs : dict (None)
+            The options of normalize.
+    indent : int (4)
+            See dumps.
+    width : int (79)
+            See dumps.
+    out_encoding : str ("utf-8")
+            Encoding of the written bib-file.
+    chunk_size : int
+            Number of bytes read at once.
+    executor : concurrent.futures.Executor (None)
+            If given, normalizing and the stages run in the executor on
+            batches of items. For a ProcessPoolExecutor the stages must be
+            picklable, e.g. functions defined at the top of a module.
+    batch_size : int (256)
+            Number of items in a batch for the executor.
+    max_pending : int (8)
+            Max. number of batches submitted to the executor at once.
+    """
+    normalize_kwargs = {} if normalize_kwargs is None else normalize_kwargs
+
+    with _contextlib.ExitStack() as stack:
+        if isinstance(inp, (str, bytes, _os.PathLike)):
+            inp = stack.enter_context(open(inp, "rb"))
+        if isinstance(out, (str, bytes, _os.PathLike)):
+            out = stack.enter_context(open(out, "wt", encoding=out_encoding))
+
+        items = iter_loads(f=inp, chunk_size=chunk_size)
+        if executor is None:
+            items = _iter_transformed(
+                items=items, normalize_kwargs=normalize_kwargs, stages=stages
+            )
+        else:
+            items = _iter_transformed_in_executor(
+                items=items,
+                normalize_kwargs=normalize_kwargs,
+                stages=stages,
+                executor=executor,
+                batch_size=batch_size,
+                max_pending=max_pending,
+            )
+        for s in iter_dumps(items=items, indent=indent, width=width):
+            out.write(s)
+
+
+def sort_file(
+    path,
+    out_path,
+    key="citekey",
+    max_run_bytes=64 * 1024 * 1024,
+    max_merge_runs=64,
+    on_collision="keep",
+    normalize_kwargs=None,
+    indent=4,
+    width=79,
+    out_encoding="utf-8",
+    chunk_size=DEFAULT_CHUNK_SIZE,
+):
+    """
+    Writes the bib-file in path sorted into out_path using an external sort
+    so that bib-files larger than the memory can be sorted.
+    The entries are loaded and normalized one by one. Sorted runs of entries
+    are spilled to temporary files and eventually merged. The output is
+    formatted as by dumps with preambles and strings first.
+
+    Parameters
+    ----------
+    path : str
+            Path to read the bib-file from.
+    out_path : str
+            Path to write the sorted bib-file to.
+    key : str or function ("citekey")
+            Either 'citekey', 'year_author', or a function which returns
+            the sort-key of a normalized entry.
+    max_run_bytes : int (64MiB)
+            Max. number of raw bytes of entries held in memory at once.
+            The normalized entries take roughly a few times more.
+    max_merge_runs : int (64)
+            Max. number of runs merged at once, i.e. files opened at once.
+            More runs are first merged in batches into intermediate runs.
+    on_collision : str ("keep")
+            What to do when adjacent entries in the output share the same
+            citekey. See merge_files.
+    normalize_kwargs : dict (None)
+            The options of normalize.
+    indent : int (4)
+            See dumps.
+    width : int (79)
+            See dumps.
+    out_encoding : str ("utf-8")
+            Encoding of the written bib-file.
+    chunk_size : int
+            Number of bytes read from the bib-file at once.
+
+    The out_path is only replaced when the sort succeeds.
+    """
+    keyfunc = _get_sortkey_function(key=key)
+    _check_on_collision(on_collision=on_collision)
+    if max_merge_runs < 2:
+        raise ValueError("Expected max_merge_runs to be at least 2.")
+    normalize_kwargs = {} if normalize_kwargs is None else normalize_kwargs
+    preambles = []
+    strings = []
+
+    with _tempfile.TemporaryDirectory() as tmpdir:
+        run_paths = []
+        run = []
+        run_bytes = 0
+        with open(path, "rb") as f:
+            for raw_entry_B in _iter_raw_entries_from_stream(
+                f=f, chunk_size=chunk_size
+            ):
+                section, item = _parse_raw_entry(raw_entry_B=raw_entry_B)
+                item = _normalize_item(
+                    section=section, item=item, **normalize_kwargs
+                )
+                if section == "preambles":
+                    preambles.append(item)
+                elif section == "strings":
+                    strings.append(item)
+                else:
+                    run.append(item)
+                    run_bytes += len(raw_entry_B)
+                    if run_bytes >= max_run_bytes:
+                        run_paths.append(
+                            _spill_run(run=run, keyfunc=keyfunc, tmpdir=tmpdir)
+                        )
+                        run = []
+                        run_bytes = 0
+
+        run.sort(key=keyfunc)
+        run_paths = _reduce_runs(
+            run_paths=run_paths,
+            keyfunc=keyfunc,
+            tmpdir=tmpdir,
+            max_merge_runs=max_merge_runs,
         )
-        buff += "\n"
+        run_files = [open(run_path, "rb") for run_path in run_paths]
+        try:
+            runs = [_iter_run(f=run_file) for run_file in run_files]
+            runs.append(iter(run))
+            with _open_replacing(path=out_path, encoding=out_encoding) as fout:
+                _write_sorted(
+                    fout=fout,
+                    preambles=preambles,
+                    strings=strings,
+                    entries=_heapq.merge(*runs, key=keyfunc),
+                    on_collision=on_collision,
+                    indent=indent,
+                    width=width,
+                )
+        finally:
+            for run_file in run_files:
+                run_file.close()
+
+
+def merge_files(
+    paths,
+    out_path,
+    key="citekey",
+    on_collision="first",
+    normalize_kwargs=None,
+    indent=4,
+    width=79,
+    out_encoding="utf-8",
+    chunk_size=DEFAULT_CHUNK_SIZE,
+):
+    """
+    Merges bib-files, each already sorted by key, into out_path in a single
+    streaming pass. The output is formatted as by dumps with the preambles
+    and strings of all bib-files first.
+
+    Parameters
+    ----------
+    paths : list of str
+            Paths to the sorted bib-files.
+    out_path : str
+            Path to write the merged bib-file to.
+    key : str or function ("citekey")
+            See sort_file.
+    on_collision : str ("first")
+            What to do when adjacent entries in the output share the same
+            citekey. 'first' keeps only the first entry in the order of
+            paths, 'last' keeps only the last one, 'error' raises a
+            KeyError, and 'keep' keeps all of them.
+            Collisions are only found among adjacent entries. So all
+            collisions are found for key 'citekey' only. For other keys,
+            entries with the same citekey but e.g. a different year are
+            not adjacent and are not found.
+    normalize_kwargs : dict (None)
+            The options of normalize.
+    indent : int (4)
+            See dumps.
+    width : int (79)
+            See dumps.
+    out_encoding : str ("utf-8")
+            Encoding of the written bib-file.
+    chunk_size : int
+            Number of bytes read from each bib-file at once.
+
+    Raises a ValueError when the entries of a bib-file are not sorted by key.
+    The out_path is only replaced when the merge succeeds.
+    """
+    keyfunc = _get_sortkey_function(key=key)
+    _check_on_collision(on_collision=on_collision)
+    normalize_kwargs = {} if normalize_kwargs is None else normalize_kwargs
+    preambles = []
+    strings = []
+
+    def _iter_entries(f, path):
+        previous_key = None
+        for section, item in iter_loads(f=f, chunk_size=chunk_size):
+            item = _normalize_item(
+                section=section, item=item, **normalize_kwargs
+            )
+            if section == "preambles":
+                preambles.append(item)
+            elif section == "strings":
+                strings.append(item)
+            else:
+                item_key = keyfunc(item)
+                if previous_key is not None and item_key < previous_key:
+                    raise ValueError(
+                        "Expected entries in {!r} to be sorted, "
+                        "but {!r} comes after a greater key.".format(
+                            str(path), item["citekey"]
+                        )
+                    )
+                previous_key = item_key
+                yield item
+
+    files = [open(path, "rb") for path in paths]
+    try:
+        with _tempfile.TemporaryFile(
+            mode="w+t", encoding=out_encoding
+        ) as entries_file:
+            # The preambles and strings are only known after all entries
+            # have been read but have to be written first.
+            _write_entries(
+                fout=entries_file,
+                entries=_heapq.merge(
+                    *[
+                        _iter_entries(f=f, path=path)
+                        for f, path in zip(files, paths)
+                    ],
+                    key=keyfunc,
+                ),
+                on_collision=on_collision,
+                indent=indent,
+                width=width,
+            )
+            entries_file.seek(0)
+            with _open_replacing(path=out_path, encoding=out_encoding) as fout:
+                _write_sorted(
+                    fout=fout,
+                    preambles=preambles,
+                    strings=strings,
+                    entries=[],
+                    on_collision=on_collision,
+                    indent=indent,
+                    width=width,
+                )
+                _shutil.copyfileobj(entries_file, fout)
+    finally:
+        for f in files:
+            f.close()
+
+
+async def aload(reader, chunk_size=64 * 1024, executor=None):
+    """
+    Returns a raw-byte-bib-dictionary as loads does, but reads the bytes
+    chunk by chunk from an asyncio stream. Entries are parsed as soon as
+    they are complete and the event-loop gets control between entries.
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+            Or any object with a coroutine read(n) returning bytes.
+    chunk_size : int (64KiB)
+            Number of bytes read at once.
+    executor : concurrent.futures.Executor (None)
+            If given, the entries completed by each chunk are parsed in the
+            executor instead of the event-loop's thread.
+    """
+    loop = _asyncio.get_running_loop()
+    bib = {
+        "entries": [],
+        "strings": [],
+        "preambles": [],
+    }
+    splitter = _RawEntrySplitter()
+    while True:
+        chunk = await reader.read(chunk_size)
+        if len(chunk) > 0:
+            raw_entries = splitter.feed(chunk)
+        else:
+            raw_entries = splitter.close()
+
+        if executor is not None and len(raw_entries) > 0:
+            items = await loop.run_in_executor(
+                executor, _parse_raw_entries, raw_entries
+            )
+            for section, item in items:
+                bib[section].append(item)
+        else:
+            for raw_entry_B in raw_entries:
+                section, item = _parse_raw_entry(raw_entry_B=raw_entry_B)
+                bib[section].append(item)
+                await _asyncio.sleep(0)
+
+        if len(chunk) == 0:
+            return bib
+
+
+async def adump(bib, writer, indent=4, width=79, encoding="utf-8"):
+    """
+    Writes the bibliography as dumps does into an asyncio stream. The
+    writer is drained and the event-loop gets control after each entry.
+
+    Parameters
+    ----------
+    bib : dict
+            A normalized bib-dictionary.
+    writer : asyncio.StreamWriter
+            Or any object with write(bytes) and a coroutine drain().
+    indent : int (4)
+            See dumps.
+    width : int (79)
+            See dumps.
+    encoding : str ("utf-8")
+            Encoding of the bytes written. It must be able to encode all
+            characters in bib, e.g. 'ascii' fails for a bib normalized
+            with encoding 'utf-8' from non-ascii bytes.
+    """
+    for section in ["preambles", "strings", "entries"]:
+        for item in bib[section]:
+            s = _dumps_item(
+                section=section, item=item, indent=indent, width=width
+            )
+            writer.write(str.encode(s, encoding=encoding))
+            await writer.drain()
+            await _asyncio.sleep(0)
+
+
+def _dumps_item(section, item, indent, width):
+    """
+    Returns the string of a single preamble, string, or entry as it is
+    written by dumps, including the empty line that follows it.
+    """
+    if section == "preambles":
+        return "@preamble{" + item + "}\n" + "\n"
+    if section == "strings":
+        entrytype = "string"
+        citekey = None
+    else:
+        entrytype = item["type"]
+        citekey = item["citekey"]
+    buff = _dumps_entry(
+        entrytype=entrytype,
+        citekey=citekey,
+        fields=item["fields"],
+        indent=indent,
+        width=width,
+    )
+    buff += "\n"
     return buff
 
 
+def _iter_transformed(items, normalize_kwargs, stages):
+    for section, item in iter_normalize(items=items, **normalize_kwargs):
+        for stage in stages:
+            item = stage(section, item)
+            if item is None:
+                break
+        if item is not None:
+            yield section, item
+
+
+def _transform_batch(batch, normalize_kwargs, stages):
+    return list(
+        _iter_transformed(
+            items=batch, normalize_kwargs=normalize_kwargs, stages=stages
+        )
+    )
+
+
+def _iter_batches(items, batch_size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if len(batch) > 0:
+        yield batch
+
+
+def _iter_transformed_in_executor(
+    items, normalize_kwargs, stages, executor, batch_size, max_pending
+):
+    """
+    Like _iter_transformed, but runs batches of items in the executor.
+    At most max_pending batches are submitted at once, and the results are
+    yielded in the order of the items.
+    """
+    pending = _collections.deque()
+    for batch in _iter_batches(items=items, batch_size=batch_size):
+        if len(pending) >= max_pending:
+            for section_item in pending.popleft().result():
+                yield section_item
+        pending.append(
+            executor.submit(_transform_batch, batch, normalize_kwargs, stages)
+        )
+    while len(pending) > 0:
+        for section_item in pending.popleft().result():
+            yield section_item
+
+
 def _dumps_entry(entrytype, citekey, fields, indent, width):
     buff = str()
     buff += "@" + entrytype + "{"
@@ -223,6 +677,220 @@ def _dumps_fields(fields, indent, width):
     return buff
 
 
+def _sortkey_citekey(entry):
+    return entry["citekey"]
+
+
+def _sortkey_year_author(entry):
+    fields = entry["fields"]
+    try:
+        year = int(fields["year"])
+    except (KeyError, ValueError):
+        year = _sys.maxsize
+    return (year, str(fields.get("author", "")), entry["citekey"])
+
+
+def _get_sortkey_function(key):
+    if callable(key):
+        return key
+    if key == "citekey":
+        return _sortkey_citekey
+    if key == "year_author":
+        return _sortkey_year_author
+    raise ValueError("Unknown sort-key {!r}.".format(key))
+
+
+@_contextlib.contextmanager
+def _open_replacing(path, encoding):
+    """
+    Yields a text-file next to path which replaces path only when the
+    with-block succeeds. Otherwise path is left as it is.
+    """
+    fd, tmp_path = _tempfile.mkstemp(
+        suffix=".tmp", dir=_os.path.dirname(_os.path.abspath(path))
+    )
+    try:
+        with _os.fdopen(fd, "wt", encoding=encoding) as f:
+            yield f
+        _os.replace(tmp_path, path)
+    except BaseException as err:
+        if _os.path.exists(tmp_path):
+            _os.remove(tmp_path)
+        raise err
+
+
+def _check_on_collision(on_collision):
+    if on_collision not in ["keep", "first", "last", "error"]:
+        raise ValueError("Unknown on_collision {!r}.".format(on_collision))
+
+
+def _spill_run(run, keyfunc, tmpdir):
+    """
+    Sorts the run of entries and writes it to a temporary file in tmpdir.
+    Returns the path of the file.
+    """
+    run.sort(key=keyfunc)
+    fd, run_path = _tempfile.mkstemp(suffix=".run", dir=tmpdir)
+    with _os.fdopen(fd, "wb") as f:
+        for entry in run:
+            _pickle.dump(entry, f, protocol=_pickle.HIGHEST_PROTOCOL)
+    return run_path
+
+
+def _reduce_runs(run_paths, keyfunc, tmpdir, max_merge_runs):
+    """
+    Merges consecutive batches of runs into intermediate runs until there
+    are no more than max_merge_runs runs left. Returns their paths in order.
+    """
+    while len(run_paths) > max_merge_runs:
+        merged_paths = []
+        for start in range(0, len(run_paths), max_merge_runs):
+            batch = run_paths[start : start + max_merge_runs]
+            merged_paths.append(
+                _merge_runs(run_paths=batch, keyfunc=keyfunc, tmpdir=tmpdir)
+            )
+        run_paths = merged_paths
+    return run_paths
+
+
+def _merge_runs(run_paths, keyfunc, tmpdir):
+    """
+    Merges the runs into a new run in tmpdir and removes them.
+    Returns the path of the new run.
+    """
+    if len(run_paths) == 1:
+        return run_paths[0]
+    run_files = [open(run_path, "rb") for run_path in run_paths]
+    try:
+        fd, merged_path = _tempfile.mkstemp(suffix=".run", dir=tmpdir)
+        with _os.fdopen(fd, "wb") as f:
+            for entry in _heapq.merge(
+                *[_iter_run(f=run_file) for run_file in run_files],
+                key=keyfunc
+            ):
+                _pickle.dump(entry, f, protocol=_pickle.HIGHEST_PROTOCOL)
+    finally:
+        for run_file in run_files:
+            run_file.close()
+    for run_path in run_paths:
+        _os.remove(run_path)
+    return merged_path
+
+
+def _iter_run(f):
+    while True:
+        try:
+            yield _pickle.load(f)
+        except EOFError:
+            return
+
+
+def _iter_without_collisions(entries, on_collision):
+    """
+    Yields the entries while resolving adjacent entries with the same
+    citekey according to on_collision.
+    """
+    _check_on_collision(on_collision=on_collision)
+    if on_collision == "keep":
+        for entry in entries:
+            yield entry
+        return
+
+    previous = None
+    for entry in entries:
+        if previous is not None and previous["citekey"] == entry["citekey"]:
+            if on_collision == "error":
+                raise KeyError(
+                    "Citekey {!r} collides.".format(entry["citekey"])
+                )
+            if on_collision == "last":
+                previous = entry
+            continue
+        if previous is not None:
+            yield previous
+        previous = entry
+    if previous is not None:
+        yield previous
+
+
+def _write_entries(fout, entries, on_collision, indent, width):
+    for entry in _iter_without_collisions(
+        entries=entries, on_collision=on_collision
+    ):
+        fout.write(
+            _dumps_item(
+                section="entries", item=entry, indent=indent, width=width
+            )
+        )
+
+
+def _write_sorted(
+    fout, preambles, strings, entries, on_collision, indent, width
+):
+    for section, items in [("preambles", preambles), ("strings", strings)]:
+        for item in items:
+            fout.write(
+                _dumps_item(
+                    section=section, item=item, indent=indent, width=width
+                )
+            )
+    _write_entries(
+        fout=fout,
+        entries=entries,
+        on_collision=on_collision,
+        indent=indent,
+        width=width,
+    )
+
+
+def _normalize_item(
+    section,
+    item,
+    field_keys_lower=True,
+    field_keys_ascii=True,
+    field_values_ascii=True,
+    type_lower=True,
+    type_ascii=True,
+    citekey_lower=True,
+    citekey_ascii=True,
+    preamble_values_ascii=True,
+    encoding="ascii",
+    errors="strict",
+):
+    """
+    Returns a single normalized item of a raw-byte-bib's section, i.e. one
+    of 'entries', 'strings', or 'preambles'. See normalize.
+    """
+    if section == "preambles":
+        if preamble_values_ascii:
+            return _decode(B=item, encoding=encoding, errors=errors)
+        else:
+            return item
+    if section == "strings":
+        return _normalize_entry(
+            entry=item,
+            field_keys_lower=field_keys_lower,
+            field_keys_ascii=field_keys_ascii,
+            field_values_ascii=field_values_ascii,
+            type_lower=type_lower,
+            type_ascii=type_ascii,
+            encoding=encoding,
+            errors=errors,
+        )
+    return _normalize_entry(
+        entry=item,
+        field_keys_lower=field_keys_lower,
+        field_keys_ascii=field_keys_ascii,
+        field_values_ascii=field_values_ascii,
+        type_lower=type_lower,
+        type_ascii=type_ascii,
+        citekey_lower=citekey_lower,
+        citekey_ascii=citekey_ascii,
+        encoding=encoding,
+        errors=errors,
+    )
+
+
 def _normalize_entry(
     entry,
     field_keys_lower=True,
@@ -233,34 +901,42 @@ def _normalize_entry(
     type_ascii=True,
     citekey_lower=True,
     citekey_ascii=True,
+    encoding="ascii",
+    errors="strict",
 ):
+    # Each piece is decoded with a single call to bytes.decode. Instead of
+    # wrapping every call, the failing piece is printed from the error.
     out = {}
-    if "type" in entry:
-        _type = bytes(entry["type"])
-        _type = bytes.lower(_type) if type_lower else _type
-        _type = _decode_ascii(_type) if type_ascii else _type
-        out["type"] = _type
-
-    if "citekey" in entry:
-        _ck = bytes(entry["citekey"])
-        _ck = bytes.lower(_ck) if citekey_lower else _ck
-        _ck = _decode_ascii(_ck) if citekey_ascii else _ck
-        out["citekey"] = _ck
-
-    of = {}
-    for field_key in entry["fields"]:
-        _fk = bytes(field_key)
-        _fk = bytes.lower(_fk) if field_keys_lower else _fk
-        _fk = _decode_ascii(_fk) if field_keys_ascii else _fk
-
-        if isinstance(entry["fields"][field_key], bytes):
-            _val = bytes(entry["fields"][field_key])
-            _val = _strip_latex(_val) if field_values_strip else _val
-            _val = _decode_ascii(_val) if field_values_ascii else _val
+    try:
+        if "type" in entry:
+            _type = entry["type"]
+            _type = bytes.lower(_type) if type_lower else _type
+            if type_ascii:
+                _type = bytes.decode(_type, encoding, errors)
+            out["type"] = _type
+
+        if "citekey" in entry:
+            _ck = entry["citekey"]
+            _ck = bytes.lower(_ck) if citekey_lower else _ck
+            if citekey_ascii:
+                _ck = bytes.decode(_ck, encoding, errors)
+            out["citekey"] = _ck
+
+        of = {}
+        for field_key, _val in entry["fields"].items():
+            _fk = bytes.lower(field_key) if field_keys_lower else field_key
+            if field_keys_ascii:
+                _fk = bytes.decode(_fk, encoding, errors)
+
+            if isinstance(_val, bytes):
+                _val = _strip_latex(_val) if field_values_strip else _val
+                if field_values_ascii:
+                    _val = bytes.decode(_val, encoding, errors)
             of[_fk] = _val
-        else:
-            of[_fk] = entry["fields"][field_key]
-    out["fields"] = of
+        out["fields"] = of
+    except UnicodeDecodeError as err:
+        print("Can not decode: ", err.object)
+        raise err
     return out
 
 
@@ -275,28 +951,145 @@ def _split_into_blocks(B, sep=b"@"):
     return blocks
 
 
-def _split_raw_entries(bib_B):
-    blocks = _split_into_blocks(B=bib_B)
+class _RawEntrySplitter:
+    """
+    Splits the raw entries as _split_raw_entries does, but from bytes fed
+    chunk by chunk. An entry is only complete once the next '@' arrives,
+    or the bytes end, because comments trailing the entry belong to it.
+    """
+
+    def __init__(self, sep=b"@"):
+        self.sep = sep
+        self.rest = []
+        self.entry = []
+        self.num_opening = 0
+        self.num_closing = 0
+
+    def feed(self, chunk):
+        """
+        Returns the list of raw entries completed by chunk.
+        Only chunk is searched for sep. The chunks of an incomplete block
+        are kept in a list and joined once the block is complete.
+        """
+        _blocks = bytes.split(chunk, sep=self.sep)
+        self.rest.append(_blocks[0])
+        if len(_blocks) == 1:
+            return []
+        _blocks[0] = bytes.join(b"", self.rest)
+        self.rest = [_blocks.pop()]
+        entries = []
+        for _block in _blocks:
+            if len(_block) > 0:
+                entries += self._add_block(bytes.join(b"", [self.sep, _block]))
+        return entries
+
+    def close(self):
+        """
+        Returns the list of the remaining raw entries at the end of the bytes.
+        """
+        entries = []
+        _block = bytes.join(b"", self.rest)
+        self.rest = []
+        if len(_block) > 0:
+            entries += self._add_block(bytes.join(b"", [self.sep, _block]))
+        assert len(self.entry) == 0, "Expected braces to close before end."
+        return entries
+
+    def _add_block(self, block):
+        self.entry.append(block)
+        self.num_opening += bytes.count(block, b"{")
+        self.num_closing += bytes.count(block, b"}")
+        if self.num_opening != self.num_closing:
+            return []
+        entry = bytes.join(b"", self.entry)
+        self.entry = []
+        self.num_opening = 0
+        self.num_closing = 0
+        return [entry]
+
+
+def _iter_raw_entries_from_stream(f, chunk_size):
+    """
+    Yields the raw entries from the binary stream f read chunk by chunk.
+    """
+    splitter = _RawEntrySplitter()
+    while True:
+        chunk = f.read(chunk_size)
+        if len(chunk) == 0:
+            break
+        for raw_entry_B in splitter.feed(chunk):
+            yield raw_entry_B
+    for raw_entry_B in splitter.close():
+        yield raw_entry_B
 
-    entries = []
-    blkidx = 0
-    while blkidx < len(blocks):
-        entry = []
-        block = blocks[blkidx]
-        entry.append(block)
-        blkidx += 1
+
+def _iter_raw_entries(blocks):
+    """
+    Yields the raw entries from an iterable of blocks. An entry ends with
+    the first block where the numbers of opening and closing braces match.
+    """
+    blocks = iter(blocks)
+    for block in blocks:
+        entry = [block]
         num_opening = bytes.count(block, b"{")
         num_closing = bytes.count(block, b"}")
 
         while num_opening != num_closing:
-            block = blocks[blkidx]
+            block = next(blocks, None)
+            assert block is not None, "Expected braces to close before end."
             entry.append(block)
-            blkidx += 1
             num_opening += bytes.count(block, b"{")
             num_closing += bytes.count(block, b"}")
 
-        entries.append(bytes.join(b"", entry))
-    return entries
+        yield bytes.join(b"", entry)
+
+
+def _split_raw_entries(bib_B):
+    blocks = _split_into_blocks(B=bib_B)
+    return list(_iter_raw_entries(blocks=blocks))
+
+
+def _parse_raw_entries(raw_entries):
+    return [_parse_raw_entry(raw_entry_B=r) for r in raw_entries]
+
+
+def _parse_raw_entry(raw_entry_B):
+    """
+    Returns (section, item) for a single raw entry as it is split from the
+    bib-file.
+    """
+    try:
+        entry_B = bytes(raw_entry_B)
+        entry_B = _remove_trailing_comments_from_entry_bytes(entry_B=entry_B)
+        entry_B = bytes.replace(entry_B, b"\r", b"")
+        entry_B = bytes.replace(entry_B, b"\n", b"")
+    except Exception as err:
+        print("Error in: ", raw_entry_B)
+        raise err
+
+    try:
+        entrytype_B = _parse_entrytype_bytes(entry_B=entry_B)
+        if bytes.lower(entrytype_B) == b"string":
+            fields_B = _parse_fields_bytes(entry_B=entry_B)
+            field_dict = _parse_fields_into_dict(fields_B=fields_B)
+            string = {}
+            string["fields"] = field_dict
+            return "strings", string
+        elif bytes.lower(entrytype_B) == b"preamble":
+            preamble = _parse_preamble_bytes(entry_B=entry_B)
+            return "preambles", preamble
+        else:
+            citekey_B = _parse_citekey_bytes(entry_B=entry_B)
+            fields_B = _parse_fields_bytes(entry_B=entry_B)
+            field_dict = _parse_fields_into_dict(fields_B=fields_B)
+            entry = {}
+            entry["fields"] = field_dict
+            entry["type"] = entrytype_B
+            entry["citekey"] = citekey_B
+            return "entries", entry
+    except Exception as err:
+        print("Error in: ", entry_B)
+        raise err
 
 
 def _remove_trailing_comments_from_entry_bytes(entry_B):
@@ -403,8 +1196,7 @@ def _strip_latex(B):
     """
     Returns bytes without leading, trailing, or consecutive whitespaces.
     """
-    out = bytes.strip(B)
-    return b" ".join(out.split())
+    return b" ".join(bytes.split(B))
 
 
 def _advance(B, pos):
@@ -417,12 +1209,20 @@ def _advance(B, pos):
     return bytes.join(b"", [m * b" ", B[m:]])
 
 
-def _decode_ascii(B):
+def _resolve_encoding(encoding):
+    """
+    Returns the codec's name of encoding, and raises a LookupError for
+    unknown encodings before anything is decoded.
+    """
+    return _codecs.lookup(encoding).name
+
+
+def _decode(B, encoding="ascii", errors="strict"):
     """
-    Decode B to ascii and print B in case of errors.
+    Decode B to encoding and print B in case of errors.
     """
     try:
-        asc = bytes.decode(B, encoding="ascii", errors="strict")
+        asc = bytes.decode(B, encoding=encoding, errors=errors)
         return asc
     except Exception as err:
         print("Can not decode: ", B)
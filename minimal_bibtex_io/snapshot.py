@@ -0,0 +1,341 @@
+"""
+Compact binary snapshot of a bib-dictionary which is read lazily from a
+memory-map. All sections are little-endian.
+
+    header
+    string-table:   offsets (uint64, num_strings + 1), kinds (uint8),
+                    and the concatenated bytes of all strings.
+    entries:        records of (type, citekey, first_field, num_fields).
+    string-entries: records as for entries.
+    fields:         records of (key, value_kind, value). The value is
+                    either a reference, an int64, or a reference to the
+                    decimal str of an int too big for int64.
+    preambles:      references (uint32) into the string-table.
+
+Every str, or bytes in a bib-dictionary is stored once in the string-table
+and referenced by its index. The kind of a string-table-item tells whether
+it is a str (utf-8) or bytes.
+"""
+import mmap as _mmap
+import struct as _struct
+
+MAGIC = b"MBIBSNP1"
+
+_HEADER = _struct.Struct("<8s12Q")
+_OFFSET = _struct.Struct("<Q")
+_RECORD = _struct.Struct("<IIII")
+_FIELD = _struct.Struct("<IIq")
+_REF = _struct.Struct("<I")
+
+_NONE = 0xFFFFFFFF
+_KIND_STR = 0
+_KIND_BYTES = 1
+_VALUE_REF = 0
+_VALUE_INT = 1
+_VALUE_BIGINT = 2
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+SECTIONS = ["entries", "strings", "preambles"]
+
+
+def save_snapshot(bib, path):
+    """
+    Writes the bib-dictionary into a binary snapshot-file.
+
+    Parameters
+    ----------
+    bib : dict
+            A bib-dictionary as returned by loads, or normalize.
+    path : str
+            Path of the snapshot-file.
+    """
+    table = _StringTable()
+    fields = bytearray()
+    num_fields = 0
+
+    records = {}
+    for section in ["entries", "strings"]:
+        records[section] = bytearray()
+        for entry in bib[section]:
+            records[section] += _RECORD.pack(
+                table.ref(entry["type"]) if "type" in entry else _NONE,
+                table.ref(entry["citekey"]) if "citekey" in entry else _NONE,
+                num_fields,
+                len(entry["fields"]),
+            )
+            for key in entry["fields"]:
+                value = entry["fields"][key]
+                if isinstance(value, int) and (
+                    _INT64_MIN <= value <= _INT64_MAX
+                ):
+                    fields += _FIELD.pack(table.ref(key), _VALUE_INT, value)
+                elif isinstance(value, int):
+                    fields += _FIELD.pack(
+                        table.ref(key), _VALUE_BIGINT, table.ref(str(value))
+                    )
+                else:
+                    fields += _FIELD.pack(
+                        table.ref(key), _VALUE_REF, table.ref(value)
+                    )
+                num_fields += 1
+
+    preambles = bytearray()
+    for preamble in bib["preambles"]:
+        preambles += _REF.pack(table.ref(preamble))
+
+    offsets = bytearray()
+    for offset in table.offsets:
+        offsets += _OFFSET.pack(offset)
+    kinds = bytes(table.kinds)
+    data = bytes.join(b"", table.data)
+
+    blocks = [offsets, kinds, data, records["entries"], records["strings"]]
+    blocks += [fields, preambles]
+    starts = []
+    pos = _HEADER.size
+    for block in blocks:
+        pos = _align(pos)
+        starts.append(pos)
+        pos += len(block)
+
+    header = _HEADER.pack(
+        MAGIC,
+        len(table.kinds),
+        len(bib["entries"]),
+        len(bib["strings"]),
+        num_fields,
+        len(bib["preambles"]),
+        *starts
+    )
+    with open(path, "wb") as f:
+        f.write(header)
+        pos = _HEADER.size
+        for i, block in enumerate(blocks):
+            f.write(b"\0" * (starts[i] - pos))
+            f.write(block)
+            pos = starts[i] + len(block)
+
+
+def open_snapshot(path):
+    """
+    Returns a Snapshot of the snapshot-file in path. The file is
+    memory-mapped and entries are only decoded when accessed. Processes
+    which open the same snapshot-file share its pages.
+
+    Parameters
+    ----------
+    path : str
+            Path of the snapshot-file written by save_snapshot.
+    """
+    return Snapshot(path=path)
+
+
+class Snapshot:
+    """
+    A read-only bib-dictionary on a memory-mapped snapshot-file.
+    The sections 'entries', 'strings', and 'preambles' are lazy sequences
+    and can be passed to e.g. dumps, or normalize as any bib-dictionary.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+        try:
+            self._read_header()
+        except Exception as err:
+            self._mm.close()
+            raise err
+        self._sections = {
+            "entries": _Section(
+                length=self._num_entries,
+                getter=self._get_entry,
+                start=self._entries_start,
+            ),
+            "strings": _Section(
+                length=self._num_string_entries,
+                getter=self._get_entry,
+                start=self._string_entries_start,
+            ),
+            "preambles": _Section(
+                length=self._num_preambles,
+                getter=self._get_preamble,
+                start=self._preambles_start,
+            ),
+        }
+
+    def _read_header(self):
+        """
+        Reads the header and checks that all sections are within the file.
+        Raises a ValueError otherwise.
+        """
+        size = len(self._mm)
+        if size < _HEADER.size:
+            raise ValueError("Expected snapshot-file to contain a header.")
+        header = _HEADER.unpack_from(self._mm, 0)
+        if header[0] != MAGIC:
+            raise ValueError("Expected snapshot-file to start with MAGIC.")
+        (
+            self._num_strings,
+            self._num_entries,
+            self._num_string_entries,
+            self._num_fields,
+            self._num_preambles,
+            self._offsets_start,
+            self._kinds_start,
+            self._data_start,
+            self._entries_start,
+            self._string_entries_start,
+            self._fields_start,
+            self._preambles_start,
+        ) = header[1:]
+
+        sections = [
+            (self._offsets_start, _OFFSET.size * (self._num_strings + 1)),
+            (self._kinds_start, self._num_strings),
+            (self._entries_start, _RECORD.size * self._num_entries),
+            (
+                self._string_entries_start,
+                _RECORD.size * self._num_string_entries,
+            ),
+            (self._fields_start, _FIELD.size * self._num_fields),
+            (self._preambles_start, _REF.size * self._num_preambles),
+        ]
+        for start, length in sections:
+            if start < _HEADER.size or start + length > size:
+                raise ValueError("Expected snapshot-file to be complete.")
+        data_length = _OFFSET.unpack_from(
+            self._mm, self._offsets_start + _OFFSET.size * self._num_strings
+        )[0]
+        if self._data_start < _HEADER.size or (
+            self._data_start + data_length > size
+        ):
+            raise ValueError("Expected snapshot-file to be complete.")
+
+    def __getitem__(self, section):
+        return self._sections[section]
+
+    def __contains__(self, section):
+        return section in self._sections
+
+    def keys(self):
+        return list(SECTIONS)
+
+    def to_dict(self):
+        """
+        Returns the full bib-dictionary in memory.
+        """
+        return {section: list(self[section]) for section in SECTIONS}
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return "{:s}(entries={:d}, strings={:d}, preambles={:d})".format(
+            self.__class__.__name__,
+            self._num_entries,
+            self._num_string_entries,
+            self._num_preambles,
+        )
+
+    def _get_string(self, ref):
+        start = _OFFSET.unpack_from(
+            self._mm, self._offsets_start + _OFFSET.size * ref
+        )[0]
+        stop = _OFFSET.unpack_from(
+            self._mm, self._offsets_start + _OFFSET.size * (ref + 1)
+        )[0]
+        B = self._mm[self._data_start + start : self._data_start + stop]
+        if self._mm[self._kinds_start + ref] == _KIND_STR:
+            return bytes.decode(B, encoding="utf-8")
+        return B
+
+    def _get_entry(self, start, i):
+        _type, citekey, first_field, num_fields = _RECORD.unpack_from(
+            self._mm, start + _RECORD.size * i
+        )
+        out = {}
+        fields = {}
+        for f in range(first_field, first_field + num_fields):
+            key, kind, value = _FIELD.unpack_from(
+                self._mm, self._fields_start + _FIELD.size * f
+            )
+            if kind == _VALUE_INT:
+                fields[self._get_string(key)] = value
+            elif kind == _VALUE_BIGINT:
+                fields[self._get_string(key)] = int(self._get_string(value))
+            else:
+                fields[self._get_string(key)] = self._get_string(value)
+        out["fields"] = fields
+        if _type != _NONE:
+            out["type"] = self._get_string(_type)
+        if citekey != _NONE:
+            out["citekey"] = self._get_string(citekey)
+        return out
+
+    def _get_preamble(self, start, i):
+        ref = _REF.unpack_from(self._mm, start + _REF.size * i)[0]
+        return self._get_string(ref)
+
+
+class _Section:
+    """
+    A lazy sequence of the items in one section of a Snapshot.
+    """
+
+    def __init__(self, length, getter, start):
+        self._length = length
+        self._getter = getter
+        self._start = start
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._length))]
+        if i < 0:
+            i += self._length
+        if i < 0 or i >= self._length:
+            raise IndexError("Snapshot section index out of range.")
+        return self._getter(self._start, i)
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self._getter(self._start, i)
+
+
+class _StringTable:
+    def __init__(self):
+        self.refs = {}
+        self.kinds = bytearray()
+        self.data = []
+        self.offsets = [0]
+
+    def ref(self, s):
+        """
+        Returns the index of s in the table and adds s if needed.
+        """
+        if isinstance(s, str):
+            kind = _KIND_STR
+            B = str.encode(s, encoding="utf-8")
+        else:
+            kind = _KIND_BYTES
+            B = bytes(s)
+        k = (kind, B)
+        if k not in self.refs:
+            self.refs[k] = len(self.kinds)
+            self.kinds.append(kind)
+            self.data.append(B)
+            self.offsets.append(self.offsets[-1] + len(B))
+        return self.refs[k]
+
+
+def _align(pos, alignment=8):
+    return pos + (-pos) % alignment
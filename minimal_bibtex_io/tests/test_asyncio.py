@@ -0,0 +1,131 @@
+import minimal_bibtex_io as mbib
+import pkg_resources
+import asyncio
+import concurrent.futures
+import os
+import time
+
+example_bib_path = pkg_resources.resource_filename(
+    "minimal_bibtex_io", os.path.join("tests", "resources", "example.bib")
+)
+
+
+class BytesWriter:
+    def __init__(self):
+        self.buff = bytearray()
+
+    def write(self, b):
+        self.buff += b
+
+    async def drain(self):
+        pass
+
+
+def make_large_bib_bytes(num_entries):
+    bib = {"entries": [], "strings": [], "preambles": []}
+    for i in range(num_entries):
+        entry = {"type": "article", "citekey": "key{:d}".format(i)}
+        entry["fields"] = {
+            "title": "A title with some words number {:d}".format(i),
+            "author": "Doe, John and Roe, Jane",
+            "year": 1900 + i % 100,
+        }
+        bib["entries"].append(entry)
+    return str.encode(mbib.dumps(bib), encoding="ascii")
+
+
+async def loop_turns_while(coro):
+    """
+    Returns the result of coro, the number of turns a ticker got from the
+    event-loop while coro ran, and the longest time between two turns.
+    The ticker only yields with sleep(0), so it gets a turn every time coro
+    yields to the event-loop.
+    """
+    gaps = []
+    done = False
+
+    async def ticker():
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    task = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+    result = await coro
+    done = True
+    await task
+    return result, len(gaps), max(gaps + [0.0])
+
+
+def reader_with(b):
+    reader = asyncio.StreamReader()
+    reader.feed_data(b)
+    reader.feed_eof()
+    return reader
+
+
+def test_aload_equals_loads():
+    with open(example_bib_path, "rb") as f:
+        b = f.read()
+
+    async def main():
+        return await mbib.aload(reader_with(b), chunk_size=5)
+
+    assert asyncio.run(main()) == mbib.loads(b)
+
+
+def test_aload_with_executor():
+    b = make_large_bib_bytes(num_entries=200)
+
+    async def main():
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
+            return await mbib.aload(reader_with(b), executor=ex)
+
+    assert asyncio.run(main()) == mbib.loads(b)
+
+
+def test_aload_does_not_stall_event_loop():
+    b = make_large_bib_bytes(num_entries=10000)
+
+    async def main():
+        return await loop_turns_while(
+            mbib.aload(reader_with(b), chunk_size=16 * 1024)
+        )
+
+    t_start = time.perf_counter()
+    bib, num_turns, max_stall = asyncio.run(main())
+    duration = time.perf_counter() - t_start
+
+    assert len(bib["entries"]) == 10000
+    # yielding once per chunk would only give about 70 turns
+    assert num_turns >= 10000
+    assert max_stall < duration / 4
+
+
+def test_adump_equals_dumps():
+    with open(example_bib_path, "rb") as f:
+        bib = mbib.normalize(mbib.loads(f.read()))
+
+    async def main():
+        writer = BytesWriter()
+        await mbib.adump(bib, writer)
+        return bytes(writer.buff)
+
+    assert bytes.decode(asyncio.run(main()), "ascii") == mbib.dumps(bib)
+
+
+def test_adump_non_ascii():
+    bib = {"entries": [], "strings": [], "preambles": []}
+    entry = {"type": "book", "citekey": "mueller", "fields": {}}
+    entry["fields"]["author"] = "Jürgen Müller"
+    bib["entries"].append(entry)
+
+    async def main():
+        writer = BytesWriter()
+        await mbib.adump(bib, writer)
+        return bytes(writer.buff)
+
+    assert bytes.decode(asyncio.run(main()), "utf-8") == mbib.dumps(bib)
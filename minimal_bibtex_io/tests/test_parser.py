@@ -201,3 +201,49 @@ def test_find_first_quote_not_escaped():
     assert mbib._find_first_quote_not_escaped(b'{"}"') == 3
     assert mbib._find_first_quote_not_escaped(b'abc{"la"la"} hui') == -1
     assert mbib._find_first_quote_not_escaped(b'abc{"la"la"} hui"') == 16
+
+
+NON_ASCII_BIB = str.encode(
+    "@Book{Müller2020, year = 2020, Author = {Jürgen Müller}}",
+    encoding="utf-8",
+)
+
+
+def test_normalize_encoding():
+    rawbib = mbib.loads(NON_ASCII_BIB)
+
+    with pytest.raises(UnicodeDecodeError):
+        mbib.normalize(rawbib)
+
+    bib = mbib.normalize(rawbib, encoding="utf-8")
+    entry = bib["entries"][0]
+    assert entry["type"] == "book"
+    assert entry["citekey"] == "müller2020"
+    assert entry["fields"]["author"] == "Jürgen Müller"
+    assert entry["fields"]["year"] == 2020
+
+    bib = mbib.normalize(rawbib, encoding="latin-1")
+    assert bib["entries"][0]["fields"]["author"] == "JÃ¼rgen MÃ¼ller"
+
+    bib = mbib.normalize(rawbib, errors="replace")
+    assert bib["entries"][0]["fields"]["author"] == "J��rgen M��ller"
+
+
+def test_normalize_example_bib_same_for_ascii_compatible_encodings():
+    with open(example_bib_path, "rb") as f:
+        rawbib = mbib.loads(f.read())
+
+    bib = mbib.normalize(rawbib)
+    for encoding in ["utf-8", "latin-1", "cp1252"]:
+        assert bib == mbib.normalize(rawbib, encoding=encoding)
+
+
+def test_normalize_prints_piece_which_can_not_be_decoded(capsys):
+    rawbib = mbib.loads(NON_ASCII_BIB)
+    with pytest.raises(UnicodeDecodeError):
+        mbib.normalize(rawbib)
+    captured = capsys.readouterr()
+    assert "m\\xc3\\xbcller2020" in captured.out
+
+    with pytest.raises(LookupError):
+        mbib.normalize(rawbib, encoding="no-such-encoding")
@@ -0,0 +1,138 @@
+import minimal_bibtex_io as mbib
+import pkg_resources
+import concurrent.futures
+import io
+import os
+import tempfile
+import tracemalloc
+
+example_bib_path = pkg_resources.resource_filename(
+    "minimal_bibtex_io", os.path.join("tests", "resources", "example.bib")
+)
+
+
+class NullWriter:
+    def write(self, s):
+        pass
+
+
+def drop_pitfalls(section, item):
+    if section == "entries" and item["type"] == "pitfall":
+        return None
+    return item
+
+
+def upper_citekeys(section, item):
+    if section == "entries":
+        item["citekey"] = str.upper(item["citekey"])
+    return item
+
+
+def make_bib_bytes(num_entries):
+    buff = io.BytesIO()
+    for i in range(num_entries):
+        entry = "@article{{key{:d}, year = 2000, title = {{Title {:d}}}}}\n"
+        buff.write(str.encode(entry.format(i, i), encoding="ascii"))
+    return buff.getvalue()
+
+
+def expected_example():
+    with open(example_bib_path, "rb") as f:
+        items = list(mbib.iter_normalize(mbib.iter_loads(f)))
+    out = []
+    for section, item in items:
+        item = drop_pitfalls(section, item)
+        if item is not None:
+            out.append((section, upper_citekeys(section, item)))
+    return str.join("", mbib.iter_dumps(out))
+
+
+def test_iter_loads_equals_loads():
+    with open(example_bib_path, "rb") as f:
+        b = f.read()
+    rawbib = mbib.loads(b)
+
+    for chunk_size in [1, 7, 1024]:
+        streamed = {"entries": [], "strings": [], "preambles": []}
+        for section, item in mbib.iter_loads(
+            f=io.BytesIO(b), chunk_size=chunk_size
+        ):
+            streamed[section].append(item)
+        assert streamed == rawbib
+
+
+def test_iter_dumps_equals_dumps_when_grouped():
+    with open(example_bib_path, "rb") as f:
+        bib = mbib.normalize(mbib.loads(f.read()))
+    items = []
+    for section in ["preambles", "strings", "entries"]:
+        items += [(section, item) for item in bib[section]]
+    assert str.join("", mbib.iter_dumps(items)) == mbib.dumps(bib)
+
+
+def test_transform_paths():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        out_path = os.path.join(tmpdir, "out.bib")
+        mbib.transform(
+            inp=example_bib_path,
+            out=out_path,
+            stages=[drop_pitfalls, upper_citekeys],
+        )
+        with open(out_path, "rt", encoding="utf-8") as f:
+            out = f.read()
+
+    assert out == expected_example()
+    bib = mbib.loads(str.encode(out, "ascii"))
+    assert len(bib["entries"]) == 3
+    assert bib["entries"][0]["citekey"] == b"COMPANION"
+
+
+def test_transform_file_objects_and_executors():
+    expected = expected_example()
+    for Executor in [
+        concurrent.futures.ThreadPoolExecutor,
+        concurrent.futures.ProcessPoolExecutor,
+    ]:
+        with Executor(max_workers=2) as executor:
+            out = io.StringIO()
+            with open(example_bib_path, "rb") as f:
+                mbib.transform(
+                    inp=f,
+                    out=out,
+                    stages=[drop_pitfalls, upper_citekeys],
+                    executor=executor,
+                    batch_size=2,
+                    max_pending=2,
+                )
+        assert out.getvalue() == expected
+
+
+def test_transform_memory_does_not_grow_with_input():
+    peaks = []
+    for num_entries in [1000, 4000]:
+        inp = io.BytesIO(make_bib_bytes(num_entries=num_entries))
+        tracemalloc.start()
+        mbib.transform(inp=inp, out=NullWriter(), chunk_size=16 * 1024)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak)
+    assert peaks[1] < 1.5 * peaks[0]
+
+
+def test_transform_out_encoding():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        inp = os.path.join(tmpdir, "in.bib")
+        with open(inp, "wb") as f:
+            f.write(str.encode("@article{k, title={Müller}}", "utf-8"))
+
+        for out_encoding in ["utf-8", "latin-1"]:
+            out = os.path.join(tmpdir, "out.bib")
+            mbib.transform(
+                inp=inp,
+                out=out,
+                normalize_kwargs={"encoding": "utf-8"},
+                out_encoding=out_encoding,
+            )
+            with open(out, "rb") as f:
+                b = f.read()
+            assert str.encode("Müller", out_encoding) in b
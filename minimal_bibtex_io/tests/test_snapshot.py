@@ -0,0 +1,93 @@
+import minimal_bibtex_io as mbib
+import pkg_resources
+import os
+import pytest
+import tempfile
+
+example_bib_path = pkg_resources.resource_filename(
+    "minimal_bibtex_io", os.path.join("tests", "resources", "example.bib")
+)
+
+
+def test_snapshot_raw_and_normalized():
+    with open(example_bib_path, "rb") as f:
+        rawbib = mbib.loads(f.read())
+    bib = mbib.normalize(rawbib)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for original in [rawbib, bib]:
+            path = os.path.join(tmpdir, "bib.snapshot")
+            mbib.save_snapshot(bib=original, path=path)
+            with mbib.open_snapshot(path=path) as snap:
+                assert len(snap["entries"]) == len(original["entries"])
+                assert snap["entries"][-1] == original["entries"][-1]
+                assert snap["entries"][0:2] == original["entries"][0:2]
+                assert snap.to_dict() == original
+                with pytest.raises(IndexError):
+                    snap["entries"][len(original["entries"])]
+
+        with mbib.open_snapshot(path=path) as snap:
+            assert mbib.dumps(snap) == mbib.dumps(bib)
+
+
+def test_snapshot_empty_and_bad_magic():
+    bib = {"entries": [], "strings": [], "preambles": []}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "bib.snapshot")
+        mbib.save_snapshot(bib=bib, path=path)
+        with mbib.open_snapshot(path=path) as snap:
+            assert snap.to_dict() == bib
+
+        with open(path, "wb") as f:
+            f.write(b"not a snapshot" * 10)
+        with pytest.raises(ValueError):
+            mbib.open_snapshot(path=path)
+
+
+def test_snapshot_truncated():
+    with open(example_bib_path, "rb") as f:
+        bib = mbib.normalize(mbib.loads(f.read()))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "bib.snapshot")
+        mbib.save_snapshot(bib=bib, path=path)
+        with open(path, "rb") as f:
+            b = f.read()
+
+        for size in [0, 8, 50, len(b) // 2, len(b) - 1]:
+            truncated_path = os.path.join(tmpdir, "truncated.snapshot")
+            with open(truncated_path, "wb") as f:
+                f.write(b[0:size])
+            with pytest.raises(ValueError):
+                mbib.open_snapshot(path=truncated_path)
+
+
+def test_snapshot_is_lazy(monkeypatch):
+    num_entries = 20000
+    bib = {"entries": [], "strings": [], "preambles": []}
+    for i in range(num_entries):
+        entry = {"type": "article", "citekey": "key{:d}".format(i)}
+        entry["fields"] = {"title": "Title {:d}".format(i), "year": 2000}
+        bib["entries"].append(entry)
+
+    num_decoded = []
+    _get_string = mbib.snapshot.Snapshot._get_string
+
+    def counting_get_string(self, ref):
+        num_decoded.append(ref)
+        return _get_string(self, ref)
+
+    monkeypatch.setattr(
+        mbib.snapshot.Snapshot, "_get_string", counting_get_string
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "bib.snapshot")
+        mbib.save_snapshot(bib=bib, path=path)
+        with mbib.open_snapshot(path=path) as snap:
+            assert len(snap["entries"]) == num_entries
+            assert len(num_decoded) == 0
+
+            assert snap["entries"][12345] == bib["entries"][12345]
+            # type, citekey, and two field-keys plus one field-value
+            assert len(num_decoded) == 5
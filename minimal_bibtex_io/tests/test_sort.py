@@ -0,0 +1,267 @@
+import minimal_bibtex_io as mbib
+import pkg_resources
+import os
+import pathlib
+import pytest
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+example_bib_path = pkg_resources.resource_filename(
+    "minimal_bibtex_io", os.path.join("tests", "resources", "example.bib")
+)
+
+
+def make_bib(citekeys, years=None):
+    bib = {"entries": [], "strings": [], "preambles": []}
+    for i, citekey in enumerate(citekeys):
+        entry = {"type": "article", "citekey": citekey, "fields": {}}
+        entry["fields"]["title"] = "Title of " + citekey
+        if years is not None:
+            entry["fields"]["year"] = years[i]
+        bib["entries"].append(entry)
+    return bib
+
+
+def write_bib(path, bib):
+    with open(path, "wt") as f:
+        f.write(mbib.dumps(bib))
+
+
+def read_bib(path):
+    with open(path, "rb") as f:
+        return mbib.normalize(mbib.loads(f.read()))
+
+
+def test_sort_file_with_many_runs():
+    citekeys = ["k{:03d}".format(i) for i in range(100)]
+    shuffled = citekeys[::3] + citekeys[1::3] + citekeys[2::3]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        inp = os.path.join(tmpdir, "in.bib")
+        out = os.path.join(tmpdir, "out.bib")
+        write_bib(inp, make_bib(shuffled))
+        mbib.sort_file(path=inp, out_path=out, max_run_bytes=200)
+        bib = read_bib(out)
+
+    assert [e["citekey"] for e in bib["entries"]] == citekeys
+
+
+def test_sort_file_year_author_keeps_strings_and_preambles():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        out = os.path.join(tmpdir, "out.bib")
+        mbib.sort_file(
+            path=example_bib_path,
+            out_path=out,
+            key="year_author",
+            max_run_bytes=1,
+        )
+        bib = read_bib(out)
+
+    assert len(bib["preambles"]) == 3
+    assert len(bib["strings"]) == 1
+    years = [e["fields"].get("year", 10000) for e in bib["entries"]]
+    assert years == sorted(years)
+    assert len(bib["entries"]) == 4
+
+
+def test_merge_files_collisions():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        a = os.path.join(tmpdir, "a.bib")
+        b = os.path.join(tmpdir, "b.bib")
+        out = os.path.join(tmpdir, "out.bib")
+
+        bib_a = make_bib(["a", "c", "e"])
+        bib_b = make_bib(["b", "c", "d"])
+        bib_b["entries"][1]["fields"]["title"] = "other"
+        write_bib(a, bib_a)
+        write_bib(b, bib_b)
+
+        mbib.merge_files(paths=[a, b], out_path=out, on_collision="first")
+        bib = read_bib(out)
+        assert [e["citekey"] for e in bib["entries"]] == list("abcde")
+        assert bib["entries"][2]["fields"]["title"] == "Title of c"
+
+        mbib.merge_files(paths=[a, b], out_path=out, on_collision="last")
+        bib = read_bib(out)
+        assert bib["entries"][2]["fields"]["title"] == "other"
+
+        mbib.merge_files(paths=[a, b], out_path=out, on_collision="keep")
+        bib = read_bib(out)
+        assert [e["citekey"] for e in bib["entries"]] == list("abccde")
+
+        with pytest.raises(KeyError):
+            mbib.merge_files(paths=[a, b], out_path=out, on_collision="error")
+
+
+def test_stream_splitter_long_block_without_at():
+    preamble = b"@preamble{" + b"x" * (4 * 1024 * 1024) + b"}\n"
+    b = preamble + b"@type{citekey,a={A}}"
+
+    splitter = mbib._RawEntrySplitter()
+    raw_entries = []
+    for start in range(0, len(b), 4096):
+        raw_entries += splitter.feed(b[start : start + 4096])
+    raw_entries += splitter.close()
+
+    assert raw_entries == mbib._split_raw_entries(b)
+    assert len(splitter.rest) == 0
+
+
+def test_stream_splitter_is_linear():
+    def duration(num_bytes):
+        b = b"@preamble{" + b"x" * num_bytes + b"}"
+        splitter = mbib._RawEntrySplitter()
+        t_start = time.perf_counter()
+        for start in range(0, len(b), 4096):
+            splitter.feed(b[start : start + 4096])
+        splitter.close()
+        return time.perf_counter() - t_start
+
+    small = min(duration(1024 * 1024) for i in range(3))
+    large = min(duration(8 * 1024 * 1024) for i in range(3))
+    # quadratic would be 64 times slower
+    assert large < 24 * small + 0.01
+
+
+def test_merge_files_raises_on_unsorted_input():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        a = os.path.join(tmpdir, "a.bib")
+        b = os.path.join(tmpdir, "b.bib")
+        out = os.path.join(tmpdir, "out.bib")
+        write_bib(a, make_bib(["b", "c"]))
+        write_bib(b, make_bib(["z", "a"]))
+
+        with pytest.raises(ValueError):
+            mbib.merge_files(paths=[a, b], out_path=out)
+
+
+def test_sort_file_normalize_kwargs():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        inp = os.path.join(tmpdir, "in.bib")
+        out = os.path.join(tmpdir, "out.bib")
+        with open(inp, "wb") as f:
+            f.write(str.encode("@article{k, title={Müller}}", "utf-8"))
+
+        with pytest.raises(UnicodeDecodeError):
+            mbib.sort_file(path=inp, out_path=out)
+
+        mbib.sort_file(
+            path=inp, out_path=out, normalize_kwargs={"encoding": "utf-8"}
+        )
+        with open(out, "rb") as f:
+            bib = mbib.normalize(mbib.loads(f.read()), encoding="utf-8")
+    assert bib["entries"][0]["fields"]["title"] == "Müller"
+
+
+def test_error_messages_with_path_and_bytes_citekeys():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        a = pathlib.Path(tmpdir) / "a.bib"
+        b = pathlib.Path(tmpdir) / "b.bib"
+        out = os.path.join(tmpdir, "out.bib")
+        write_bib(a, make_bib(["z", "a"]))
+        write_bib(b, make_bib(["a", "b"]))
+
+        with pytest.raises(ValueError) as exc_info:
+            mbib.merge_files(paths=[a], out_path=out)
+        assert "a.bib" in str(exc_info.value)
+
+        with pytest.raises(KeyError) as exc_info:
+            mbib.merge_files(
+                paths=[b, b],
+                out_path=out,
+                on_collision="error",
+                normalize_kwargs={"citekey_ascii": False},
+            )
+        assert "b'a'" in str(exc_info.value)
+
+
+def test_bad_options_raise_value_error():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        out = os.path.join(tmpdir, "out.bib")
+        with pytest.raises(ValueError):
+            mbib.sort_file(path=example_bib_path, out_path=out, key="bogus")
+        with pytest.raises(ValueError):
+            mbib.merge_files(
+                paths=[example_bib_path], out_path=out, on_collision="bogus"
+            )
+
+
+def test_out_path_is_kept_when_sort_or_merge_fails():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        a = os.path.join(tmpdir, "a.bib")
+        out = os.path.join(tmpdir, "out.bib")
+        bib = make_bib(["a", "a"])
+        bib["preambles"].append('"x"')
+        write_bib(a, bib)
+        with open(out, "wt") as f:
+            f.write("previous")
+
+        with pytest.raises(ValueError):
+            mbib.sort_file(path=a, out_path=out, on_collision="bogus")
+        with pytest.raises(KeyError):
+            mbib.sort_file(path=a, out_path=out, on_collision="error")
+        with pytest.raises(KeyError):
+            mbib.merge_files(paths=[a], out_path=out, on_collision="error")
+
+        with open(out, "rt") as f:
+            assert f.read() == "previous"
+        assert sorted(os.listdir(tmpdir)) == ["a.bib", "out.bib"]
+
+
+def test_sort_file_merges_runs_in_batches():
+    citekeys = ["k{:04d}".format(i) for i in range(300)]
+    shuffled = citekeys[::7] + citekeys[3::7] + citekeys[1::7]
+    shuffled += citekeys[5::7] + citekeys[2::7] + citekeys[6::7]
+    shuffled += citekeys[4::7]
+    bib = make_bib(shuffled)
+    duplicate = make_bib(["k0000"])["entries"][0]
+    duplicate["fields"]["title"] = "duplicate"
+    bib["entries"].append(duplicate)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        inp = os.path.join(tmpdir, "in.bib")
+        out = os.path.join(tmpdir, "out.bib")
+        write_bib(inp, bib)
+        mbib.sort_file(
+            path=inp,
+            out_path=out,
+            max_run_bytes=1,
+            max_merge_runs=3,
+            on_collision="first",
+        )
+        result = read_bib(out)
+
+    assert [e["citekey"] for e in result["entries"]] == citekeys
+    assert result["entries"][0]["fields"]["title"] == "Title of k0000"
+
+
+@pytest.mark.skipif(
+    resource is None or not os.path.isdir("/proc/self/fd"),
+    reason="Needs resource-limits and /proc/self/fd.",
+)
+def test_sort_file_many_runs_with_few_open_files():
+    num_entries = 3000
+    citekeys = ["k{:04d}".format(i) for i in range(num_entries)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        inp = os.path.join(tmpdir, "in.bib")
+        out = os.path.join(tmpdir, "out.bib")
+        write_bib(inp, make_bib(citekeys[::-1]))
+
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        num_open = len(os.listdir("/proc/self/fd"))
+        resource.setrlimit(resource.RLIMIT_NOFILE, (num_open + 24, hard))
+        try:
+            mbib.sort_file(
+                path=inp, out_path=out, max_run_bytes=20, max_merge_runs=16
+            )
+        finally:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+        bib = read_bib(out)
+
+    assert [e["citekey"] for e in bib["entries"]] == citekeys